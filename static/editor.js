@@ -0,0 +1,324 @@
+let currentCodeId = null;
+
+// Every API call goes through here for the shared headers. No keepalive: none of these calls
+// need to outlive the page, and its 64 KiB in-flight byte quota would reject large descriptions
+const API_HEADERS = {
+    'Content-Type': 'application/json',
+    'X-API-Key': API_KEY
+};
+
+// At most MAX_IN_FLIGHT API requests at once (browser per-origin limit); the rest queue in order
+const MAX_IN_FLIGHT = 6;
+let inFlight = 0;
+const waiting = [];
+
+function acquireSlot() {
+    if (inFlight < MAX_IN_FLIGHT) {
+        inFlight++;
+        return Promise.resolve();
+    }
+    return new Promise(resolve => waiting.push(resolve));
+}
+
+function releaseSlot() {
+    // Hand the slot straight to the next waiter so a new caller can't jump the queue
+    const next = waiting.shift();
+    if (next) {
+        next();
+    } else {
+        inFlight--;
+    }
+}
+
+async function apiFetch(url, options = {}) {
+    await acquireSlot();
+    try {
+        return await fetch(url, {
+            ...options,
+            headers: options.headers ? { ...API_HEADERS, ...options.headers } : API_HEADERS
+        });
+    } finally {
+        releaseSlot();
+    }
+}
+
+function copyToClipboard(elementId) {
+    const element = document.getElementById(elementId);
+    const text = element.innerText;
+
+    navigator.clipboard.writeText(text).then(() => {
+        showStatus('apiStatus', '✅ Copied to clipboard!', 'success');
+    }).catch(err => {
+        showStatus('apiStatus', '❌ Failed to copy', 'error');
+    });
+}
+
+function showStatus(elementId, message, type = 'info') {
+    const element = document.getElementById(elementId);
+    element.innerHTML = message;
+    element.className = `status ${type}`;
+    element.style.display = 'block';
+
+    if (type !== 'error') {
+        setTimeout(() => {
+            element.style.display = 'none';
+        }, 5000);
+    }
+}
+
+function setLoading(buttonId, isLoading) {
+    const button = document.querySelector(`#${buttonId}`);
+    if (!button) return;
+
+    if (isLoading) {
+        button.innerHTML = '<span class="loading"></span> Processing...';
+        button.disabled = true;
+    } else {
+        button.innerHTML = '✨ Generate Code with AI';
+        button.disabled = false;
+    }
+}
+
+async function generateCode() {
+    const botName = document.getElementById('botName').value;
+    const description = document.getElementById('botDescription').value;
+
+    if (!description.trim()) {
+        showStatus('generateStatus', '❌ Please enter a description', 'error');
+        return;
+    }
+
+    setLoading('generateText', true);
+    showStatus('generateStatus', '⏳ Generating code with AI...', 'info');
+
+    try {
+        const response = await apiFetch('/api/code/generate', {
+            method: 'POST',
+            body: JSON.stringify({
+                bot_name: botName,
+                description: description
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            currentCodeId = data.code_id;
+
+            // Show code
+            const codeOutput = document.getElementById('codeOutput');
+            codeOutput.innerHTML = `<h4>Generated Code (ID: ${data.code_id})</h4><pre>${data.full_code}</pre>`;
+            codeOutput.style.display = 'block';
+
+            // Show approve controls
+            document.getElementById('approveControls').style.display = 'block';
+            document.getElementById('currentCodeId').innerText = data.code_id;
+
+            showStatus('generateStatus', `✅ Code generated successfully! ${data.openai_used ? '(OpenAI)' : '(Fallback)'}`, 'success');
+        } else {
+            showStatus('generateStatus', `❌ Error: ${data.detail || 'Unknown error'}`, 'error');
+        }
+    } catch (error) {
+        showStatus('generateStatus', `❌ Network error: ${error.message}`, 'error');
+    } finally {
+        setLoading('generateText', false);
+    }
+}
+
+async function approveCode() {
+    if (!currentCodeId) {
+        showStatus('approveStatus', '❌ No code generated yet', 'error');
+        return;
+    }
+
+    showStatus('approveStatus', '⏳ Approving code...', 'info');
+
+    try {
+        const response = await apiFetch(`/api/code/approve/${currentCodeId}`, {
+            method: 'POST',
+            body: JSON.stringify({
+                override_token: OVERRIDE_TOKEN
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            showStatus('approveStatus', '✅ Code approved successfully!', 'success');
+        } else {
+            showStatus('approveStatus', `❌ Error: ${data.detail || 'Approval failed'}`, 'error');
+        }
+    } catch (error) {
+        showStatus('approveStatus', `❌ Network error: ${error.message}`, 'error');
+    }
+}
+
+async function createSimpleBot() {
+    showStatus('quickActionsStatus', '⏳ Creating bot...', 'info');
+
+    try {
+        const response = await apiFetch('/api/bots', {
+            method: 'POST',
+            body: JSON.stringify({
+                name: 'QuickBot-' + Date.now().toString().slice(-4),
+                skills: ['general', 'quick'],
+                description: 'A quick test bot'
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            showStatus('quickActionsStatus', `✅ Bot created: ${data.bot.name}`, 'success');
+        } else {
+            showStatus('quickActionsStatus', `❌ Error: ${data.detail}`, 'error');
+        }
+    } catch (error) {
+        showStatus('quickActionsStatus', `❌ Network error: ${error.message}`, 'error');
+    }
+}
+
+// Created once; constructing a formatter per bot is the expensive part of toLocaleDateString()
+const dateFormat = new Intl.DateTimeFormat();
+
+function renderBotCard(bot) {
+    const card = document.createElement('div');
+    card.className = 'bot-card';
+
+    const name = document.createElement('strong');
+    name.textContent = bot.name;
+
+    // Strings passed to append() become text nodes, so bot fields are never parsed as HTML
+    card.append(
+        name, ` (ID: ${bot.id})`, document.createElement('br'),
+        `Skills: ${bot.skills?.join(', ') || 'none'}`, document.createElement('br'),
+        `Created: ${dateFormat.format(new Date(bot.created_at))}`
+    );
+    return card;
+}
+
+async function listBots() {
+    showStatus('quickActionsStatus', '⏳ Loading bots...', 'info');
+
+    try {
+        const response = await apiFetch('/api/bots');
+
+        const data = await response.json();
+
+        if (data.success || data.bots) {
+            const botsList = document.getElementById('botsList');
+            const bots = data.bots || data;
+
+            if (bots.length === 0) {
+                botsList.textContent = 'No bots yet. Create one first!';
+            } else {
+                // Build off-document and swap in once: one reflow, no HTML parsing
+                const fragment = document.createDocumentFragment();
+                const heading = document.createElement('h4');
+                heading.textContent = 'Your Bots:';
+                fragment.appendChild(heading);
+                for (const bot of bots) {
+                    fragment.appendChild(renderBotCard(bot));
+                }
+                botsList.replaceChildren(fragment);
+            }
+
+            botsList.style.display = 'block';
+            showStatus('quickActionsStatus', `✅ Loaded ${bots.length} bots`, 'success');
+        } else {
+            showStatus('quickActionsStatus', '❌ No bots found', 'error');
+        }
+    } catch (error) {
+        showStatus('quickActionsStatus', `❌ Network error: ${error.message}`, 'error');
+    }
+}
+
+const HEALTH_CACHE_MS = 30000;
+
+function showHealth(data) {
+    showStatus('quickActionsStatus', `✅ System healthy • Bots: ${data.bots_count} • OpenAI: ${data.openai}`, 'success');
+}
+
+async function checkHealth() {
+    try {
+        const response = await fetch('/health');
+        const data = await response.json();
+
+        sessionStorage.setItem('health', JSON.stringify(data));
+        sessionStorage.setItem('health_ts', Date.now().toString());
+        showHealth(data);
+    } catch (error) {
+        showStatus('quickActionsStatus', `❌ Health check failed: ${error.message}`, 'error');
+    }
+}
+
+async function createBotFromCode() {
+    if (!currentCodeId) {
+        showStatus('approveStatus', '❌ Generate code first', 'error');
+        return;
+    }
+
+    const botName = prompt('Enter bot name:', 'AIBot');
+    if (!botName) return;
+
+    showStatus('approveStatus', '⏳ Creating bot from code...', 'info');
+
+    // First create a bot
+    try {
+        const response = await apiFetch('/api/bots', {
+            method: 'POST',
+            body: JSON.stringify({
+                name: botName,
+                skills: ['ai', 'generated'],
+                description: 'Created from AI-generated code'
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            showStatus('approveStatus', `✅ Bot "${botName}" created from AI code!`, 'success');
+        } else {
+            showStatus('approveStatus', `❌ Error creating bot: ${data.detail}`, 'error');
+        }
+    } catch (error) {
+        showStatus('approveStatus', `❌ Network error: ${error.message}`, 'error');
+    }
+}
+
+async function assignTask() {
+    // Server picks the first bot, so this is a single round trip
+    try {
+        const taskResponse = await apiFetch('/api/tasks/assign_to_first', {
+            method: 'POST',
+            body: JSON.stringify({
+                task: 'Test task from web editor',
+                timeout: 10
+            })
+        });
+
+        const taskData = await taskResponse.json();
+
+        if (taskResponse.status === 404) {
+            showStatus('quickActionsStatus', '❌ No bots available. Create one first.', 'error');
+        } else if (taskData.success) {
+            showStatus('quickActionsStatus', `✅ Task assigned to ${taskData.bot}!`, 'success');
+        } else {
+            showStatus('quickActionsStatus', `❌ Error: ${taskData.detail}`, 'error');
+        }
+    } catch (error) {
+        showStatus('quickActionsStatus', `❌ Network error: ${error.message}`, 'error');
+    }
+}
+
+// Initial health check - reuse a result from the last 30 s so quick reloads don't hit the server
+window.addEventListener('load', () => {
+    const cached = sessionStorage.getItem('health');
+    const cachedAt = Number(sessionStorage.getItem('health_ts'));
+
+    if (cached && Date.now() - cachedAt < HEALTH_CACHE_MS) {
+        showHealth(JSON.parse(cached));
+    } else {
+        checkHealth();
+    }
+});